@@ -8,15 +8,21 @@ Author: AI Traffic Light System
 License: MIT
 """
 
-import random
+import heapq
 import math
 import time
-import threading
 import pygame
 import sys
 import os
 import traceback
 import json
+import logging
+import logging.handlers
+import queue
+from collections import OrderedDict, defaultdict, deque
+from contextlib import contextmanager, nullcontext
+import numpy as np
+from numba import njit
 
 # Configuration Constants
 DEFAULT_RED = 150
@@ -30,6 +36,27 @@ SIM_TIME = 300  # Total simulation time in seconds
 NO_OF_SIGNALS = 4
 NO_OF_LANES = 2
 DETECTION_TIME = 5
+VERBOSE = False  # Log the per-second signal status table
+FPS_CAP = 60  # Maximum frames rendered per second
+UPS = 60  # Simulation ticks per second, independent of the frame rate
+UPS_RESET = 5  # Ticks of lag after which the update clock skips ahead
+TEXT_CACHE_SIZE = 256  # Rendered text surfaces kept between frames
+SHOW_TIMINGS = False  # Overlay the FPS and average time per frame phase
+TIMING_WINDOW = 100  # Frames averaged by the timing overlay
+TIMING_REFRESH = 30  # Frames between timing overlay refreshes
+
+# Frames to render flat out in a hidden window before reporting the frame
+# rate and exiting; 0 runs the simulation normally (set by run.py --bench)
+BENCH_MODE = int(os.environ.get("BENCH_MODE", "0"))
+
+# Event handling
+# Window events where only the most recent one per frame matters
+COALESCED_EVENTS = (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE, pygame.ACTIVEEVENT)
+# Window events that stop and resume drawing while the window cannot be seen
+HIDE_EVENTS = (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN)
+SHOW_EVENTS = (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN)
+# Event types the main loop handles; everything else is dropped unread
+HANDLED_EVENTS = (pygame.QUIT,) + HIDE_EVENTS + SHOW_EVENTS + COALESCED_EVENTS
 
 # Vehicle timing parameters (seconds to pass intersection)
 VEHICLE_TIMES = {
@@ -60,82 +87,212 @@ VEHICLE_TYPES = {
     5: 'emergency'
     
 }
+VEHICLE_CLASS_IDS = {name: class_id for class_id, name in VEHICLE_TYPES.items()}
 
-# Direction mapping
-DIRECTIONS = {
-    0: 'right',
-    1: 'down',
-    2: 'left',
-    3: 'up'
-}
+# Seconds to pass the intersection indexed by class id (1 for unlisted classes)
+TIME_BY_CLASS = np.array([VEHICLE_TIMES.get(VEHICLE_TYPES[i], 1) for i in range(len(VEHICLE_TYPES))],
+                         dtype=np.float32)
 
-# Vehicle spawn coordinates
-SPAWN_COORDS = {
-    'right': {'x': [0, 0, 0], 'y': [348, 370, 398]},
-    'down': {'x': [755, 727, 697], 'y': [0, 0, 0]},
-    'left': {'x': [1400, 1400, 1400], 'y': [498, 466, 436]},
-    'up': {'x': [602, 627, 657], 'y': [800, 800, 800]}
-}
+# Direction names, indexed by direction number
+DIRECTIONS = ('right', 'down', 'left', 'up')
+
+# Per-direction tables below are indexed by direction number (see DIRECTIONS)
+
+# Vehicle spawn coordinates: (x, y) for each lane
+SPAWN_COORDS = (
+    ((0, 348), (0, 370), (0, 398)),
+    ((755, 0), (727, 0), (697, 0)),
+    ((1400, 498), (1400, 466), (1400, 436)),
+    ((602, 800), (627, 800), (657, 800))
+)
 
 # Stop line coordinates
-STOP_LINES = {
-    'right': 590,
-    'down': 330,
-    'left': 800,
-    'up': 535
-}
+STOP_LINES = (590, 330, 800, 535)
 
 # Default stop positions
-DEFAULT_STOPS = {
-    'right': 580,
-    'down': 320,
-    'left': 810,
-    'up': 545
-}
+DEFAULT_STOPS = (580, 320, 810, 545)
 
 # Signal display coordinates
-SIGNAL_COORDS = [(530, 230), (810, 230), (810, 570), (530, 570)]
-TIMER_COORDS = [(530, 210), (810, 210), (810, 550), (530, 550)]
-COUNT_COORDS = [(480, 210), (880, 210), (880, 550), (480, 550)]
-
-# Turn coordinates
-TURN_MIDPOINTS = {
-    'right': {'x': 705, 'y': 445},
-    'down': {'x': 695, 'y': 450},
-    'left': {'x': 695, 'y': 425},
-    'up': {'x': 695, 'y': 400}
-}
+SIGNAL_COORDS = ((530, 230), (810, 230), (810, 570), (530, 570))
+TIMER_COORDS = ((530, 210), (810, 210), (810, 550), (530, 550))
+COUNT_COORDS = ((480, 210), (880, 210), (880, 550), (480, 550))
+
+# Turn coordinates: (x, y)
+TURN_MIDPOINTS = ((705, 445), (695, 450), (695, 425), (695, 400))
+
+# Movement axis (0 = x, 1 = y) and sign of travel for each approach
+LANE_AXES = ((0, 1), (1, 1), (0, -1), (1, -1))
+
+# Per-tick position change while a vehicle is rotating through its turn
+TURN_STEPS = ((2, 1.8), (-2.5, 2), (-1.8, -2.5), (1, -1))
+
+# Array copies of the tables above for the movement kernel
+DIRECTION_AXES = np.array([axis for axis, _ in LANE_AXES], dtype=np.int8)
+DIRECTION_SIGNS = np.array([sign for _, sign in LANE_AXES], dtype=np.int8)
+STOP_LINE_TABLE = np.array(STOP_LINES, dtype=np.float32)
+TURN_MIDPOINT_TABLE = np.array(
+    [TURN_MIDPOINTS[i][LANE_AXES[i][0]] for i in range(NO_OF_SIGNALS)],
+    dtype=np.float32
+)
+TURN_STEP_TABLE = np.array(TURN_STEPS, dtype=np.float32)
+
+# Sign applied to the travel-axis coordinate to rank emergency vehicle arrival
+ARRIVAL_SIGNS = np.array([1, -1, -1, 1], dtype=np.float32)
 
 # Vehicle spacing
 STOPPING_GAP = 15
 MOVING_GAP = 15
 ROTATION_ANGLE = 3
 
+logger = logging.getLogger("ai_traffic_simulation")
+
+# Initial capacity of the per-vehicle state arrays (grown on demand)
+MAX_VEHICLES = 1024
+
+# Number of random draws sampled at once for vehicle generation
+SPAWN_BATCH_SIZE = 4096
+
 # Global variables
 signals = []
 time_elapsed = 0
 current_green = 0
 current_yellow = 0
 lane_last_green_time = [0 for _ in range(NO_OF_SIGNALS)]
-waiting_times = []
-
-# Vehicle storage
-vehicles = {
-    'right': {0: [], 1: [], 2: [], 'crossed': 0},
-    'down': {0: [], 1: [], 2: [], 'crossed': 0},
-    'left': {0: [], 1: [], 2: [], 'crossed': 0},
-    'up': {0: [], 1: [], 2: [], 'crossed': 0}
-}
+waiting_times = np.empty(MAX_VEHICLES, dtype=np.float32)
+waiting_time_count = 0
+
+crossed_counts = np.zeros(NO_OF_SIGNALS, dtype=np.int64)
+
+
+
+class VehicleStore:
+    """Structure-of-arrays storage for per-vehicle simulation state.
+
+    Every vehicle owns one slot (its ``idx``) in a set of parallel NumPy
+    arrays, so movement and signal logic read contiguous columns instead of
+    chasing attributes across vehicle objects.
+    """
+
+    FIELDS = (
+        ('pos_x', np.float32),
+        ('pos_y', np.float32),
+        ('speed', np.float32),
+        ('width', np.float32),
+        ('height', np.float32),
+        ('stop', np.float32),
+        ('crossed', np.int8),
+        ('turned', np.int8),
+        ('will_turn', np.int8),
+        ('rotate_angle', np.int16),
+        ('vehicle_class_id', np.int8),
+        ('spawn_time', np.int32),
+        ('waiting_time', np.int32),
+        ('direction_id', np.int8),
+        ('lane_id', np.int8),
+        ('leader', np.intp),
+        ('active', np.int8),
+    )
+
+    def __init__(self, capacity=MAX_VEHICLES):
+        self.count = 0
+        self.capacity = capacity
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.empty(capacity, dtype=dtype))
+
+    def _grow(self):
+        """Double the capacity of every column, keeping existing values."""
+        self.capacity *= 2
+        for name, dtype in self.FIELDS:
+            column = np.empty(self.capacity, dtype=dtype)
+            column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+
+    def add(self, x, y, speed, width, height, will_turn, class_id, spawn_time,
+            direction_id, lane_id, leader):
+        """Allocate a slot for a new vehicle and return its index.
+
+        ``leader`` is the index of the vehicle spawned just before it in the
+        same lane, or -1 if the lane was empty.
+        """
+        if self.count == self.capacity:
+            self._grow()
+        idx = self.count
+        self.pos_x[idx] = x
+        self.pos_y[idx] = y
+        self.speed[idx] = speed
+        self.width[idx] = width
+        self.height[idx] = height
+        self.stop[idx] = 0
+        self.crossed[idx] = 0
+        self.turned[idx] = 0
+        self.will_turn[idx] = will_turn
+        self.rotate_angle[idx] = 0
+        self.vehicle_class_id[idx] = class_id
+        self.spawn_time[idx] = spawn_time
+        self.waiting_time[idx] = 0
+        self.direction_id[idx] = direction_id
+        self.lane_id[idx] = lane_id
+        self.leader[idx] = leader
+        self.active[idx] = 1
+        self.count += 1
+        return idx
+
+
+class LaneQueue:
+    """Growable array of store indices for one lane, kept in spawn order.
+
+    Vehicles only ever leave a lane from the front, so removal just advances
+    ``head``.
+    """
+
+    def __init__(self, capacity=64):
+        self.items = np.empty(capacity, dtype=np.intp)
+        self.head = 0
+        self.size = 0
+
+    def append(self, idx):
+        if self.size == len(self.items):
+            items = np.empty(2 * len(self.items), dtype=np.intp)
+            items[:self.size] = self.items[:self.size]
+            self.items = items
+        self.items[self.size] = idx
+        self.size += 1
+
+    def pop_front(self, count=1):
+        self.head += count
+
+    def last(self):
+        """Store index of the most recently added vehicle, or -1 if empty."""
+        return self.items[self.size - 1] if self.size > self.head else -1
+
+    def view(self):
+        return self.items[self.head:self.size]
+
+
+store = VehicleStore()
+
+# Store indices per lane, in spawn order
+lane_order = [[LaneQueue() for _ in range(3)] for _ in range(NO_OF_SIGNALS)]
+
+# Vehicles requested by the generator task, created when the simulation steps
+spawn_queue = deque()
+
+# Waiting (not yet crossed) vehicles per direction and class, counted up on
+# spawn and down on crossing
+waiting_summary = np.zeros((NO_OF_SIGNALS, len(VEHICLE_TYPES)), dtype=np.int32)
 
 # Initialize Pygame
 pygame.init()
-simulation = pygame.sprite.Group()
-move_lock = threading.Lock()
+
+# Vehicles on screen, keyed by store index in spawn order
+simulation = {}
 
 
 class TrafficSignal:
     """Represents a traffic signal with timing controls."""
     
+    __slots__ = ('red', 'yellow', 'green', 'minimum', 'maximum', 'signal_text', 'total_green_time')
+    
     def __init__(self, red, yellow, green, minimum, maximum):
         self.red = red
         self.yellow = yellow
@@ -146,385 +303,303 @@ class TrafficSignal:
         self.total_green_time = 0
 
 
-class Vehicle(pygame.sprite.Sprite):
-    """Represents a vehicle in the traffic simulation."""
+def vehicle_image_path(direction, vehicle_class):
+    """Return the image file used for a vehicle class on an approach."""
+    if vehicle_class == 'emergency':
+        return f"images/{direction}/emergency_icon.png"
+    return f"images/{direction}/{vehicle_class}.png"
+
+
+def load_image(path, alpha=True):
+    """Load an image, converted to the display's pixel format once one is set.
+
+    Unconverted surfaces are converted again on every blit, so images are
+    only loaded after ``pygame.display.set_mode`` during normal runs. Opaque
+    images pass ``alpha=False`` so their blits skip per-pixel blending.
+    """
+    image = pygame.image.load(path)
+    if pygame.display.get_surface() is not None:
+        image = image.convert_alpha() if alpha else image.convert()
+    return image
+
+
+def load_vehicle_images():
+    """Load every vehicle image once and pre-rotate it for turning.
+
+    All vehicles of a class on an approach share the surfaces loaded here.
+    Turns advance ``ROTATION_ANGLE`` degrees per tick from 0 to 90, so each
+    image only ever needs a handful of distinct rotations.
+    """
+    for direction_number, direction in enumerate(DIRECTIONS):
+        for vehicle_class in VEHICLE_TYPES.values():
+            image = load_image(vehicle_image_path(direction, vehicle_class))
+            VEHICLE_IMAGES[(direction_number, vehicle_class)] = image
+            for angle in range(0, 91, ROTATION_ANGLE):
+                rotated = pygame.transform.rotate(image, -angle)
+                if pygame.display.get_surface() is not None:
+                    rotated = rotated.convert_alpha()
+                ROTATED_IMAGES[(vehicle_class, direction_number, angle)] = rotated
+
+
+# Filled by load_vehicle_images() once the display exists
+VEHICLE_IMAGES = {}
+ROTATED_IMAGES = {}
+
+
+def _store_field(name):
+    """Expose a VehicleStore column as an attribute of the owning Vehicle."""
+    def getter(self):
+        return getattr(store, name)[self.idx].item()
+
+    def setter(self, value):
+        getattr(store, name)[self.idx] = value
+
+    return property(getter, setter)
+
+
+class Vehicle:
+    """Represents a vehicle in the traffic simulation.
+
+    Numeric state lives in ``store`` at slot ``self.idx``; the object only
+    keeps identity, lane bookkeeping and the images used for drawing.
+    """
+
+    # The store-backed stop below is a class-level property, so only the
+    # plain attributes need slots
+    __slots__ = ('lane', 'vehicle_class', 'direction_number', 'direction', 'original_image', 'idx')
+
+    stop = _store_field('stop')
     
     def __init__(self, lane, vehicle_class, direction_number, direction, will_turn):
-        pygame.sprite.Sprite.__init__(self)
         self.lane = lane
         self.vehicle_class = vehicle_class
-        self.speed = VEHICLE_SPEEDS[vehicle_class]
         self.direction_number = direction_number
         self.direction = direction
         
-        # Set initial position
-        self.x = SPAWN_COORDS[direction]['x'][lane]
-        self.y = SPAWN_COORDS[direction]['y'][lane]
-        
-        # Vehicle state
-        self.crossed = 0
-        self.will_turn = will_turn
-        self.turned = 0
-        self.rotate_angle = 0
-        self.waiting_time = 0
-        self.spawn_time = time_elapsed
-        self.cross_time = None
-        
-        # Add to vehicle list
-        vehicles[direction][lane].append(self)
-        self.index = len(vehicles[direction][lane]) - 1
-        
-        # Load vehicle image
-        if vehicle_class == 'emergency':
-            path = f"images/{direction}/emergency_icon.png"
-        else:
-            path = f"images/{direction}/{vehicle_class}.png"
+        # Shared vehicle image
+        if not VEHICLE_IMAGES:
+            load_vehicle_images()
+        self.original_image = VEHICLE_IMAGES[(direction_number, vehicle_class)]
         
-        self.original_image = pygame.image.load(path)
-        self.current_image = pygame.image.load(path)
+        # Allocate state slot; the size is read once here and only swapped
+        # when a turn completes
+        lane_queue = lane_order[direction_number][lane]
+        width, height = self.original_image.get_size()
+        self.idx = store.add(
+            SPAWN_COORDS[direction_number][lane][0],
+            SPAWN_COORDS[direction_number][lane][1],
+            VEHICLE_SPEEDS[vehicle_class],
+            width,
+            height,
+            will_turn,
+            VEHICLE_CLASS_IDS[vehicle_class],
+            time_elapsed,
+            direction_number,
+            lane,
+            lane_queue.last(),
+        )
+        
+        waiting_summary[direction_number, VEHICLE_CLASS_IDS[vehicle_class]] += 1
+        
+        # Add to the back of the lane
+        lane_queue.append(self.idx)
         
         # Set stop position
         self._set_stop_position()
-        simulation.add(self)
+        simulation[self.idx] = self
 
     def _set_stop_position(self):
-        """Set the stop position based on previous vehicle in lane."""
-        lane_list = vehicles[self.direction][self.lane]
-        
-        if len(lane_list) > 1 and lane_list[self.index - 1].crossed == 0:
-            prev_vehicle = lane_list[self.index - 1]
-            if self.direction == 'right':
-                self.stop = prev_vehicle.stop - prev_vehicle.current_image.get_rect().width - STOPPING_GAP
-            elif self.direction == 'left':
-                self.stop = prev_vehicle.stop + prev_vehicle.current_image.get_rect().width + STOPPING_GAP
-            elif self.direction == 'down':
-                self.stop = prev_vehicle.stop - prev_vehicle.current_image.get_rect().height - STOPPING_GAP
-            elif self.direction == 'up':
-                self.stop = prev_vehicle.stop + prev_vehicle.current_image.get_rect().height + STOPPING_GAP
-        else:
-            self.stop = DEFAULT_STOPS[self.direction]
-
-    def render(self, screen):
-        """Render the vehicle on screen."""
-        screen.blit(self.current_image, (self.x, self.y))
-
-    def move(self):
-        """Move the vehicle based on traffic rules and conditions."""
-        with move_lock:
-            moved = False
-            lane_list = vehicles[self.direction][self.lane]
-            
-            try:
-                idx = lane_list.index(self)
-            except ValueError:
-                return  # Vehicle already removed
-            
-            # Increment waiting time if not crossed
-            if self.crossed == 0:
-                self.waiting_time += 1
-            
-            # Handle crossing detection
-            self._check_crossing()
-            
-            # Move based on direction
-            if self.direction == 'right':
-                moved = self._move_right(idx, lane_list)
-            elif self.direction == 'down':
-                moved = self._move_down(idx, lane_list)
-            elif self.direction == 'left':
-                moved = self._move_left(idx, lane_list)
-            elif self.direction == 'up':
-                moved = self._move_up(idx, lane_list)
-
-    def _check_crossing(self):
-        """Check if vehicle has crossed the intersection."""
-        if self.crossed == 0:
-            if self.direction == 'right' and self.x + self.current_image.get_rect().width > STOP_LINES[self.direction]:
-                self._mark_crossed()
-            elif self.direction == 'down' and self.y + self.current_image.get_rect().height > STOP_LINES[self.direction]:
-                self._mark_crossed()
-            elif self.direction == 'left' and self.x < STOP_LINES[self.direction]:
-                self._mark_crossed()
-            elif self.direction == 'up' and self.y < STOP_LINES[self.direction]:
-                self._mark_crossed()
-
-    def _mark_crossed(self):
-        """Mark vehicle as crossed and record metrics."""
-        self.crossed = 1
-        self.cross_time = time_elapsed
-        waiting_times.append(self.cross_time - self.spawn_time)
-        vehicles[self.direction]['crossed'] += 1
-
-    def _move_right(self, idx, lane_list):
-        """Move vehicle in right direction."""
-        if self.will_turn == 1:
-            return self._move_right_turn(idx, lane_list)
-        else:
-            return self._move_right_straight(idx, lane_list)
-
-    def _move_right_straight(self, idx, lane_list):
-        """Move vehicle straight in right direction."""
-        can_move = (
-            (self.x + self.current_image.get_rect().width <= self.stop or 
-             self.crossed == 1 or 
-             (current_green == 0 and current_yellow == 0)) and
-            (idx == 0 or 
-             self.x + self.current_image.get_rect().width < (lane_list[idx - 1].x - MOVING_GAP) or 
-             lane_list[idx - 1].turned == 1)
-        )
+        """Set the stop position behind the vehicle ahead in the lane."""
+        d = self.direction_number
+        leader = store.leader[self.idx]
         
-        if can_move:
-            self.x += self.speed
-            return True
-        return False
-
-    def _move_right_turn(self, idx, lane_list):
-        """Move vehicle turning right."""
-        if self.crossed == 0 or self.x + self.current_image.get_rect().width < TURN_MIDPOINTS[self.direction]['x']:
-            # Pre-turn movement
-            can_move = (
-                (self.x + self.current_image.get_rect().width <= self.stop or 
-                 (current_green == 0 and current_yellow == 0) or 
-                 self.crossed == 1) and
-                (idx == 0 or 
-                 self.x + self.current_image.get_rect().width < (lane_list[idx - 1].x - MOVING_GAP) or 
-                 lane_list[idx - 1].turned == 1)
-            )
-            
-            if can_move:
-                self.x += self.speed
-                return True
-        else:
-            # Turning movement
-            if self.turned == 0:
-                self.rotate_angle += ROTATION_ANGLE
-                self.current_image = pygame.transform.rotate(self.original_image, -self.rotate_angle)
-                self.x += 2
-                self.y += 1.8
-                if self.rotate_angle == 90:
-                    self.turned = 1
-                return True
+        # The leader is the vehicle ahead for as long as it is still in the
+        # lane; vehicles only leave a lane from the front
+        if leader >= 0 and store.active[leader] and store.crossed[leader] == 0:
+            size = float(store.height[leader] if DIRECTION_AXES[d] == 1 else store.width[leader])
+            if DIRECTION_SIGNS[d] > 0:
+                self.stop = float(store.stop[leader]) - size - STOPPING_GAP
             else:
-                # Post-turn movement
-                can_move = (
-                    idx == 0 or 
-                    self.y + self.current_image.get_rect().height < (lane_list[idx - 1].y - MOVING_GAP) or 
-                    self.x + self.current_image.get_rect().width < (lane_list[idx - 1].x - MOVING_GAP)
-                )
-                
-                if can_move:
-                    self.y += self.speed
-                    return True
-        return False
-
-    def _move_down(self, idx, lane_list):
-        """Move vehicle in down direction."""
-        if self.will_turn == 1:
-            return self._move_down_turn(idx, lane_list)
+                self.stop = float(store.stop[leader]) + size + STOPPING_GAP
         else:
-            return self._move_down_straight(idx, lane_list)
-
-    def _move_down_straight(self, idx, lane_list):
-        """Move vehicle straight in down direction."""
-        can_move = (
-            (self.y + self.current_image.get_rect().height <= self.stop or 
-             self.crossed == 1 or 
-             (current_green == 1 and current_yellow == 0)) and
-            (idx == 0 or 
-             self.y + self.current_image.get_rect().height < (lane_list[idx - 1].y - MOVING_GAP) or 
-             lane_list[idx - 1].turned == 1)
-        )
+            self.stop = DEFAULT_STOPS[d]
+
+
+# Each vehicle reads its leader's position from the same tick, so lanes are
+# stepped sequentially rather than with prange
+@njit(cache=True)
+def _step_kernel(count, pos_x, pos_y, speed, width, height, stop, crossed, turned,
+                 will_turn, rotate_angle, waiting_time, direction_id, leader, active,
+                 axes, signs, stop_lines, turn_midpoints, turn_steps, green_direction,
+                 crossed_out, leaving_out, crossed_counts):
+    """Advance every active vehicle by one tick.
+
+    Vehicles are visited in spawn order, so each vehicle's leader has
+    already moved this tick when it is compared against. Store indices of
+    vehicles that crossed the stop line or left the lane this tick are
+    written to ``crossed_out`` and ``leaving_out``; their counts are returned.
+    Crossings are also added to the per-direction ``crossed_counts``.
+    """
+    n_crossed = 0
+    n_leaving = 0
+    for i in range(count):
+        if active[i] == 0:
+            continue
+        d = direction_id[i]
+        vertical = axes[d] == 1
+        sign = signs[d]
+        j = leader[i]
+        first = j < 0 or active[j] == 0
         
-        if can_move:
-            self.y += self.speed
-            return True
-        return False
-
-    def _move_down_turn(self, idx, lane_list):
-        """Move vehicle turning from down direction."""
-        if self.crossed == 0 or self.y + self.current_image.get_rect().height < TURN_MIDPOINTS[self.direction]['y']:
-            # Pre-turn movement
-            can_move = (
-                (self.y + self.current_image.get_rect().height <= self.stop or 
-                 (current_green == 1 and current_yellow == 0) or 
-                 self.crossed == 1) and
-                (idx == 0 or 
-                 self.y + self.current_image.get_rect().height < (lane_list[idx - 1].y - MOVING_GAP) or 
-                 lane_list[idx - 1].turned == 1)
-            )
-            
-            if can_move:
-                self.y += self.speed
-                return True
-        else:
-            # Turning movement
-            if self.turned == 0:
-                self.rotate_angle += ROTATION_ANGLE
-                self.current_image = pygame.transform.rotate(self.original_image, -self.rotate_angle)
-                self.x -= 2.5
-                self.y += 2
-                if self.rotate_angle == 90:
-                    self.turned = 1
-                return True
-            else:
-                # Post-turn movement
-                can_move = (
-                    idx == 0 or 
-                    self.x > (lane_list[idx - 1].x + lane_list[idx - 1].current_image.get_rect().width + MOVING_GAP) or 
-                    self.y < (lane_list[idx - 1].y - MOVING_GAP)
-                )
-                
-                if can_move:
-                    self.x -= self.speed
-                    return True
-        return False
-
-    def _move_left(self, idx, lane_list):
-        """Move vehicle in left direction."""
-        if self.crossed == 1:
-            return self._move_left_after_crossing(idx, lane_list)
-        else:
-            if self.will_turn == 1:
-                return self._move_left_turn(idx, lane_list)
-            else:
-                return self._move_left_straight(idx, lane_list)
-
-    def _move_left_after_crossing(self, idx, lane_list):
-        """Move vehicle after crossing intersection."""
-        # Find nearest vehicle ahead
-        ahead = None
-        for j in range(idx - 1, -1, -1):
-            v = lane_list[j]
-            if v.x + v.current_image.get_rect().width > 0:
-                ahead = v
-                break
-        
-        if ahead is None or self.x > (ahead.x + ahead.current_image.get_rect().width + MOVING_GAP):
-            self.x -= self.speed
-            return True
-        
-        # Remove vehicle if off screen
-        if self.x + self.current_image.get_rect().width < -10:
-            if self in lane_list:
-                lane_list.remove(self)
-            simulation.remove(self)
-        return False
-
-    def _move_left_straight(self, idx, lane_list):
-        """Move vehicle straight in left direction."""
-        can_move = (
-            (self.x >= self.stop or 
-             self.crossed == 1 or 
-             (current_green == 2 and current_yellow == 0)) and
-            (idx == 0 or 
-             self.x > (lane_list[idx - 1].x + lane_list[idx - 1].current_image.get_rect().width + MOVING_GAP))
-        )
+        # Increment waiting time if not crossed
+        if crossed[i] == 0:
+            waiting_time[i] += 1
         
-        if can_move:
-            self.x -= self.speed
-            return True
-        return False
-
-    def _move_left_turn(self, idx, lane_list):
-        """Move vehicle turning from left direction."""
-        if self.crossed == 0 or self.x > TURN_MIDPOINTS[self.direction]['x']:
-            # Pre-turn movement
-            can_move = (
-                (self.x >= self.stop or 
-                 (current_green == 2 and current_yellow == 0) or 
-                 self.crossed == 1) and
-                (idx == 0 or 
-                 self.x > (lane_list[idx - 1].x + lane_list[idx - 1].current_image.get_rect().width + MOVING_GAP) or 
-                 lane_list[idx - 1].turned == 1)
-            )
-            
-            if can_move:
-                self.x -= self.speed
-                return True
+        if vertical:
+            along = pos_y[i]
+            size = height[i]
         else:
-            # Turning movement
-            if self.turned == 0:
-                self.rotate_angle += ROTATION_ANGLE
-                self.current_image = pygame.transform.rotate(self.original_image, -self.rotate_angle)
-                self.x -= 1.8
-                self.y -= 2.5
-                if self.rotate_angle == 90:
-                    self.turned = 1
-                return True
-            else:
-                # Post-turn movement
-                can_move = (
-                    idx == 0 or 
-                    self.y > (lane_list[idx - 1].y + lane_list[idx - 1].current_image.get_rect().height + MOVING_GAP) or 
-                    self.x > (lane_list[idx - 1].x + MOVING_GAP)
-                )
-                
-                if can_move:
-                    self.y -= self.speed
-                    return True
-        return False
-
-    def _move_up(self, idx, lane_list):
-        """Move vehicle in up direction."""
-        if self.will_turn == 1:
-            return self._move_up_turn(idx, lane_list)
+            along = pos_x[i]
+            size = width[i]
+        
+        # Handle crossing detection
+        if crossed[i] == 0:
+            if (sign > 0 and along + size > stop_lines[d]) or (sign < 0 and along < stop_lines[d]):
+                crossed[i] = 1
+                crossed_counts[d] += 1
+                crossed_out[n_crossed] = i
+                n_crossed += 1
+        
+        # Vehicles that already crossed from the left keep driving off screen.
+        # Off-screen vehicles have already left the lane, so the nearest
+        # vehicle ahead is always the leader, if it is still active.
+        if d == 2 and crossed[i] == 1:
+            if first or pos_x[i] > pos_x[j] + width[j] + MOVING_GAP:
+                pos_x[i] -= speed[i]
+            # Off-screen vehicles leave the lane from the front, in FIFO order
+            if first and pos_x[i] + width[i] < -10:
+                active[i] = 0
+                leaving_out[n_leaving] = i
+                n_leaving += 1
+            continue
+        
+        if sign > 0:
+            before_turn = along + size < turn_midpoints[d]
         else:
-            return self._move_up_straight(idx, lane_list)
-
-    def _move_up_straight(self, idx, lane_list):
-        """Move vehicle straight in up direction."""
-        can_move = (
-            (self.y >= self.stop or 
-             self.crossed == 1 or 
-             (current_green == 3 and current_yellow == 0)) and
-            (idx == 0 or 
-             self.y > (lane_list[idx - 1].y + lane_list[idx - 1].current_image.get_rect().height + MOVING_GAP) or 
-             lane_list[idx - 1].turned == 1)
-        )
+            before_turn = along > turn_midpoints[d]
         
-        if can_move:
-            self.y -= self.speed
-            return True
-        return False
-
-    def _move_up_turn(self, idx, lane_list):
-        """Move vehicle turning from up direction."""
-        if self.crossed == 0 or self.y > TURN_MIDPOINTS[self.direction]['y']:
-            # Pre-turn movement
-            can_move = (
-                (self.y >= self.stop or 
-                 (current_green == 3 and current_yellow == 0) or 
-                 self.crossed == 1) and
-                (idx == 0 or 
-                 self.y > (lane_list[idx - 1].y + lane_list[idx - 1].current_image.get_rect().height + MOVING_GAP) or 
-                 lane_list[idx - 1].turned == 1)
-            )
-            
+        if will_turn[i] == 0 or crossed[i] == 0 or before_turn:
+            # Straight-line movement up to the stop line and behind the leader
+            if sign > 0:
+                can_move = along + size <= stop[i]
+            else:
+                can_move = along >= stop[i]
+            can_move = can_move or crossed[i] == 1 or d == green_direction
+            if can_move and not first and turned[j] == 0:
+                if vertical:
+                    lead_along = pos_y[j]
+                    lead_size = height[j]
+                else:
+                    lead_along = pos_x[j]
+                    lead_size = width[j]
+                if sign > 0:
+                    can_move = along + size < lead_along - MOVING_GAP
+                else:
+                    can_move = along > lead_along + lead_size + MOVING_GAP
             if can_move:
-                self.y -= self.speed
-                return True
-        else:
+                if vertical:
+                    pos_y[i] += sign * speed[i]
+                else:
+                    pos_x[i] += sign * speed[i]
+        elif turned[i] == 0:
             # Turning movement
-            if self.turned == 0:
-                self.rotate_angle += ROTATION_ANGLE
-                self.current_image = pygame.transform.rotate(self.original_image, -self.rotate_angle)
-                self.x += 1
-                self.y -= 1
-                if self.rotate_angle == 90:
-                    self.turned = 1
-                return True
-            else:
-                # Post-turn movement
-                can_move = (
-                    idx == 0 or 
-                    self.x < (lane_list[idx - 1].x - lane_list[idx - 1].current_image.get_rect().width - MOVING_GAP) or 
-                    self.y > (lane_list[idx - 1].y + MOVING_GAP)
-                )
-                
-                if can_move:
-                    self.x += self.speed
-                    return True
-        return False
+            rotate_angle[i] += ROTATION_ANGLE
+            pos_x[i] += turn_steps[d, 0]
+            pos_y[i] += turn_steps[d, 1]
+            if rotate_angle[i] == 90:
+                turned[i] = 1
+                # The rotated sprite's bounding box swaps width and height
+                width[i], height[i] = height[i], width[i]
+        else:
+            # Post-turn movement along the exit road
+            if d == 0:
+                if first or pos_y[i] + height[i] < pos_y[j] - MOVING_GAP or pos_x[i] + width[i] < pos_x[j] - MOVING_GAP:
+                    pos_y[i] += speed[i]
+            elif d == 1:
+                if first or pos_x[i] > pos_x[j] + width[j] + MOVING_GAP or pos_y[i] < pos_y[j] - MOVING_GAP:
+                    pos_x[i] -= speed[i]
+            elif d == 3:
+                if first or pos_x[i] < pos_x[j] - width[j] - MOVING_GAP or pos_y[i] > pos_y[j] + MOVING_GAP:
+                    pos_x[i] += speed[i]
+    return n_crossed, n_leaving
+
+
+def _mark_crossed(indices):
+    """Record waiting times and waiting counts for newly crossed vehicles."""
+    global waiting_times, waiting_time_count
+    
+    end = waiting_time_count + len(indices)
+    if end > len(waiting_times):
+        grown = np.empty(max(end, 2 * len(waiting_times)), dtype=np.float32)
+        grown[:waiting_time_count] = waiting_times[:waiting_time_count]
+        waiting_times = grown
+    waiting_times[waiting_time_count:end] = time_elapsed - store.spawn_time[indices]
+    waiting_time_count = end
+    np.subtract.at(waiting_summary, (store.direction_id[indices], store.vehicle_class_id[indices]), 1)
+
+
+def _remove_departed(indices):
+    """Drop vehicles that left their lane from ``lane_order`` and ``simulation``."""
+    for idx, direction_number, lane in zip(indices.tolist(), store.direction_id[indices].tolist(),
+                                           store.lane_id[indices].tolist()):
+        del simulation[idx]
+        lane_order[direction_number][lane].pop_front()
+
+
+def step_all():
+    """Create queued vehicles, then advance all vehicles by one tick."""
+    while spawn_queue:
+        Vehicle(*spawn_queue.popleft())
+    
+    count = store.count
+    green_direction = current_green if current_yellow == 0 else -1
+    crossed_out = np.empty(count, dtype=np.intp)
+    leaving_out = np.empty(count, dtype=np.intp)
+    n_crossed, n_leaving = _step_kernel(
+        count, store.pos_x, store.pos_y, store.speed, store.width, store.height,
+        store.stop, store.crossed, store.turned, store.will_turn, store.rotate_angle,
+        store.waiting_time, store.direction_id, store.leader, store.active,
+        DIRECTION_AXES, DIRECTION_SIGNS, STOP_LINE_TABLE, TURN_MIDPOINT_TABLE,
+        TURN_STEP_TABLE, green_direction, crossed_out, leaving_out, crossed_counts
+    )
+    if n_crossed:
+        _mark_crossed(crossed_out[:n_crossed])
+    if n_leaving:
+        _remove_departed(leaving_out[:n_leaving])
+
+
+def run_updates(clock=time.monotonic):
+    """Scheduler task stepping the simulation at a fixed ``UPS`` rate.
+
+    Every tick that came due on ``clock`` since the last resume is run. When
+    a stall leaves the task more than ``UPS_RESET`` ticks behind, the backlog
+    is dropped rather than replayed as a burst of catch-up ticks.
+    """
+    interval = 1.0 / UPS
+    next_tick = clock()
+    while True:
+        now = clock()
+        if now - next_tick > UPS_RESET * interval:
+            next_tick = now
+        while next_tick <= now:
+            step_all()
+            next_tick += interval
+        yield next_tick - now
+
+
+def warm_up_kernel():
+    """Compile the movement kernel ahead of the simulation clock starting."""
+    step_all()
 
 
 def initialize_signals():
@@ -543,7 +618,7 @@ def initialize_signals():
     ts4 = TrafficSignal(DEFAULT_RED, DEFAULT_YELLOW, DEFAULT_GREEN, DEFAULT_MINIMUM, DEFAULT_MAXIMUM)
     signals.append(ts4)
     
-    repeat_signal_cycle()
+    yield from repeat_signal_cycle()
 
 
 def calculate_green_time():
@@ -552,146 +627,145 @@ def calculate_green_time():
     
     # Count vehicles in next signal direction
     next_signal = (current_green + 1) % NO_OF_SIGNALS
-    direction = DIRECTIONS[next_signal]
-    
-    vehicle_counts = {'car': 0, 'bus': 0, 'truck': 0, 'rickshaw': 0, 'bike': 0, 'emergency': 0}
     
-    # Count vehicles in all lanes
-    for lane in range(3):
-        for vehicle in vehicles[direction][lane]:
-            if vehicle.crossed == 0:
-                vclass = vehicle.vehicle_class
-                if vclass in vehicle_counts:
-                    vehicle_counts[vclass] += 1
-    
-    # Calculate green time using vehicle timing
-    total_time = sum(vehicle_counts[vtype] * VEHICLE_TIMES.get(vtype, 1) for vtype in vehicle_counts)
+    # Calculate green time using vehicle timing, weighting the waiting
+    # vehicles by class
+    total_time = float(TIME_BY_CLASS @ waiting_summary[next_signal])
     green_time = math.ceil(total_time / (NO_OF_LANES + 1))
     
     # Apply limits
     green_time = max(DEFAULT_MINIMUM, min(DEFAULT_MAXIMUM, green_time))
     
-    print(f'Green Time: {green_time}')
+    logger.info(f'Green Time: {green_time}')
     signals[next_signal].green = green_time
 
 
+def scan_lanes():
+    """Summarise waiting traffic per direction.
+
+    Returns ``(waiting_counts, emergency_counts, earliest_emergency)``, each
+    indexed by direction number. ``earliest_emergency`` holds the arrival
+    estimate of the earliest waiting emergency vehicle, or ``inf`` if none.
+    """
+    waiting_counts = waiting_summary.sum(axis=1)
+    emergency_counts = waiting_summary[:, VEHICLE_CLASS_IDS['emergency']].copy()
+    
+    # Use vehicle's distance from intersection to estimate arrival time
+    count = store.count
+    emergency = ((store.crossed[:count] == 0) &
+                 (store.vehicle_class_id[:count] == VEHICLE_CLASS_IDS['emergency']))
+    emergency_directions = store.direction_id[:count][emergency]
+    vertical = DIRECTION_AXES[emergency_directions] == 1
+    along = np.where(vertical, store.pos_y[:count][emergency], store.pos_x[:count][emergency])
+    earliest_emergency = np.full(NO_OF_SIGNALS, np.inf)
+    np.minimum.at(earliest_emergency, emergency_directions, ARRIVAL_SIGNS[emergency_directions] * along)
+    
+    return waiting_counts, emergency_counts, earliest_emergency
+
+
 def repeat_signal_cycle():
-    """Main signal control loop with emergency vehicle priority."""
+    """Main signal control loop with emergency vehicle priority.
+
+    Runs as a scheduler task; every ``yield`` waits that many seconds.
+    """
     global current_green, current_yellow, time_elapsed, lane_last_green_time
     
+    # Bind module-level containers to locals for the loops below
+    _signals = signals
+    _lane_order = lane_order
+    _last_green = lane_last_green_time
+    _n = NO_OF_SIGNALS
+    
     while True:
-        # Emergency vehicle priority system - FIXED to prioritize earliest emergency vehicle
-        emergency_lanes = []
-        earliest_emergency_time = float('inf')
-        earliest_emergency_lane = None
-        
-        # Find the earliest emergency vehicle across all lanes
-        for lane_idx in range(NO_OF_SIGNALS):
-            for lane in range(3):
-                for v in vehicles[DIRECTIONS[lane_idx]][lane]:
-                    if v.crossed == 0 and v.vehicle_class == 'emergency':
-                        # Use vehicle's distance from intersection to estimate arrival time
-                        # Vehicles closer to intersection (lower x,y values) arrived earlier
-                        if DIRECTIONS[lane_idx] == 'right':
-                            arrival_estimate = v.x  # Lower x = earlier arrival
-                        elif DIRECTIONS[lane_idx] == 'left':
-                            arrival_estimate = -v.x  # Higher x = earlier arrival (negative for sorting)
-                        elif DIRECTIONS[lane_idx] == 'up':
-                            arrival_estimate = v.y  # Lower y = earlier arrival
-                        elif DIRECTIONS[lane_idx] == 'down':
-                            arrival_estimate = -v.y  # Higher y = earlier arrival (negative for sorting)
-                        
-                        if arrival_estimate < earliest_emergency_time:
-                            earliest_emergency_time = arrival_estimate
-                            earliest_emergency_lane = lane_idx
-        
-        if earliest_emergency_lane is not None:
+        waiting_counts, emergency_counts, earliest_emergency = scan_lanes()
+        
+        # Emergency vehicle priority system - prioritize earliest emergency vehicle
+        if np.isfinite(earliest_emergency).any():
             # Emergency priority logic - prioritize the lane with earliest emergency vehicle
-            selected_lane = earliest_emergency_lane
-            emergency_count = sum(1 for lane in range(3) 
-                                for v in vehicles[DIRECTIONS[selected_lane]][lane] 
-                                if v.crossed == 0 and v.vehicle_class == 'emergency')
-            waiting_count = sum(1 for lane in range(3) 
-                              for v in vehicles[DIRECTIONS[selected_lane]][lane] if v.crossed == 0)
-            waiting_time = time_elapsed - lane_last_green_time[selected_lane]
+            selected_lane = int(np.argmin(earliest_emergency))
+            emergency_count = int(emergency_counts[selected_lane])
+            max_waiting = int(waiting_counts[selected_lane])
+            max_waiting_time = time_elapsed - _last_green[selected_lane]
+            priorities = []
             
-            print(f"🚨 EMERGENCY PRIORITY: Lane {selected_lane + 1} selected (earliest emergency vehicle, {emergency_count} total emergencies)")
-            print(f"   Waiting vehicles: {waiting_count}, Waited: {waiting_time}s")
+            logger.info(f"🚨 EMERGENCY PRIORITY: Lane {selected_lane + 1} selected (earliest emergency vehicle, {emergency_count} total emergencies)")
+            logger.info(f"   Waiting vehicles: {max_waiting}, Waited: {max_waiting_time}s")
         else:
             # Normal priority logic
             priorities = []
-            for lane_idx in range(NO_OF_SIGNALS):
-                waiting_count = sum(1 for lane in range(3) 
-                                  for v in vehicles[DIRECTIONS[lane_idx]][lane] if v.crossed == 0)
-                waiting_time = time_elapsed - lane_last_green_time[lane_idx]
+            for lane_idx in range(_n):
+                waiting_count = int(waiting_counts[lane_idx])
+                waiting_time = time_elapsed - _last_green[lane_idx]
                 priority = waiting_count + 0.2 * waiting_time if waiting_count > 0 else 0
                 priorities.append((priority, lane_idx, waiting_count, waiting_time))
             
             priorities = [p for p in priorities if p[0] > 0]
             if not priorities:
-                time.sleep(1)
+                yield 1
                 continue
             
             priorities.sort(reverse=True)
             _, selected_lane, max_waiting, max_waiting_time = priorities[0]
         
         # Set selected lane as green
-        signals[selected_lane].red = DEFAULT_RED
+        green_signal = _signals[selected_lane]
+        green_signal.red = DEFAULT_RED
         current_green = selected_lane
-        lane_last_green_time[current_green] = time_elapsed
+        _last_green[current_green] = time_elapsed
         
-        print(f"Lane {current_green + 1} selected, waiting vehicles: {max_waiting}, waited: {max_waiting_time}s")
-        print(f"Lane priorities: {[round(p[0], 2) for p in priorities]}")
+        logger.info(f"Lane {current_green + 1} selected, waiting vehicles: {max_waiting}, waited: {max_waiting_time}s")
+        logger.info(f"Lane priorities: {[round(p[0], 2) for p in priorities]}")
         
         # Calculate green time using nonlinear formula
-        waiting_count = sum(1 for lane in range(3) 
-                           for v in vehicles[DIRECTIONS[current_green]][lane] if v.crossed == 0)
+        waiting_count = int(waiting_counts[current_green])
         green_time = 8 + 1.0 * (waiting_count ** 0.85)
         green_time = int(round(green_time))
         green_time = max(DEFAULT_MINIMUM, min(DEFAULT_MAXIMUM, green_time))
         
-        print(f"[NONLINEAR] Lane {current_green + 1} green time set to {green_time} seconds for {waiting_count} waiting vehicles")
-        signals[current_green].green = green_time
+        logger.info(f"[NONLINEAR] Lane {current_green + 1} green time set to {green_time} seconds for {waiting_count} waiting vehicles")
+        green_signal.green = green_time
         
         # Run green signal
-        while signals[current_green].green > 0:
+        next_signal = _signals[(current_green + 1) % _n]
+        while green_signal.green > 0:
             print_signal_status()
             update_signal_values()
             
-            if signals[(current_green + 1) % NO_OF_SIGNALS].red == DETECTION_TIME:
-                thread = threading.Thread(name="detection", target=calculate_green_time, args=())
-                thread.daemon = True
-                thread.start()
+            if next_signal.red == DETECTION_TIME:
+                calculate_green_time()
             
-            time.sleep(1)
+            yield 1
         
         # Yellow signal phase
         current_yellow = 1
-        for i in range(3):
-            for vehicle in vehicles[DIRECTIONS[current_green]][i]:
-                vehicle.stop = DEFAULT_STOPS[DIRECTIONS[current_green]]
+        for lane in _lane_order[current_green]:
+            store.stop[lane.view()] = DEFAULT_STOPS[current_green]
         
-        while signals[current_green].yellow > 0:
+        while green_signal.yellow > 0:
             print_signal_status()
             update_signal_values()
-            time.sleep(1)
+            yield 1
         
         current_yellow = 0
-        signals[current_green].yellow = DEFAULT_YELLOW
-        signals[current_green].red = DEFAULT_RED
+        green_signal.yellow = DEFAULT_YELLOW
+        green_signal.red = DEFAULT_RED
 
 
 def print_signal_status():
-    """Print current signal status to console."""
+    """Log the current signal status table."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    lines = []
     for i in range(NO_OF_SIGNALS):
         if i == current_green:
             if current_yellow == 0:
-                print(f" GREEN TS{i + 1} -> r:{signals[i].red} y:{signals[i].yellow} g:{signals[i].green}")
+                lines.append(f" GREEN TS{i + 1} -> r:{signals[i].red} y:{signals[i].yellow} g:{signals[i].green}")
             else:
-                print(f"YELLOW TS{i + 1} -> r:{signals[i].red} y:{signals[i].yellow} g:{signals[i].green}")
+                lines.append(f"YELLOW TS{i + 1} -> r:{signals[i].red} y:{signals[i].yellow} g:{signals[i].green}")
         else:
-            print(f"   RED TS{i + 1} -> r:{signals[i].red} y:{signals[i].yellow} g:{signals[i].green}")
-    print()
+            lines.append(f"   RED TS{i + 1} -> r:{signals[i].red} y:{signals[i].yellow} g:{signals[i].green}")
+    lines.append("")
+    logger.debug("\n".join(lines))
 
 
 def update_signal_values():
@@ -709,38 +783,108 @@ def update_signal_values():
                 signals[i].red = 0
 
 
+class Spawner:
+    """Random draws for vehicle generation, sampled from NumPy in batches."""
+    
+    def __init__(self, batch_size=SPAWN_BATCH_SIZE, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.batch_size = batch_size
+        self._refill()
+
+    def _refill(self):
+        """Sample the next batch of uniform draws."""
+        self.draws = self.rng.random(self.batch_size).tolist()
+        self.position = 0
+
+    def next_u01(self):
+        """Return a uniform float in [0, 1)."""
+        if self.position == self.batch_size:
+            self._refill()
+        value = self.draws[self.position]
+        self.position += 1
+        return value
+
+    def next_int(self, high):
+        """Return a uniform integer in [0, high)."""
+        return int(self.next_u01() * high)
+
+
+# Benchmarks replay the same traffic on every run
+spawner = Spawner(seed=0 if BENCH_MODE else None)
+
+
+class Scheduler:
+    """Run generator tasks cooperatively on the main thread.
+
+    A task yields the number of seconds until it wants to resume. Resumes
+    are timed from when the task was due, so periodic tasks do not drift.
+    A task that fell behind resumes once and then waits its full delay
+    from now rather than catching up. Each task resumes at most once per
+    ``run_pending`` call, even if it yields zero.
+    """
+    
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.tasks = []
+        self.sequence = 0
+
+    def spawn(self, task, delay=0.0):
+        """Schedule a generator to start after delay seconds."""
+        self._push(self.clock() + delay, task)
+
+    def _push(self, due, task):
+        # The sequence number keeps tasks due at the same time in spawn order
+        heapq.heappush(self.tasks, (due, self.sequence, task))
+        self.sequence += 1
+
+    def run_pending(self):
+        """Resume every task that has come due."""
+        now = self.clock()
+        # Take the due tasks off the heap first, so a task rescheduled at or
+        # before now waits for the next call
+        due_tasks = []
+        while self.tasks and self.tasks[0][0] <= now:
+            due, _, task = heapq.heappop(self.tasks)
+            due_tasks.append((due, task))
+        for due, task in due_tasks:
+            try:
+                delay = next(task)
+            except StopIteration:
+                continue
+            resume = due + delay
+            if resume <= now:
+                resume = now + delay
+            self._push(resume, task)
+
+
 def generate_vehicles():
-    """Generate vehicles randomly in the simulation."""
+    """Scheduler task generating vehicles randomly in the simulation."""
     while True:
         # 1.5% chance to spawn emergency vehicle
-        if random.random() < 0.015:
+        if spawner.next_u01() < 0.015:
             vehicle_type = 5  # emergency
         else:
-            vehicle_type = random.randint(0, 4)
+            vehicle_type = spawner.next_int(5)
         
         # Random lane and direction
-        lane_number = random.randint(0, 2)
-        direction_number = random.randint(0, 3)
+        lane_number = spawner.next_int(3)
+        direction_number = spawner.next_int(4)
         
-        # Determine if vehicle will turn (30% chance for rightmost lane)
+        # Determine if vehicle will turn (60% chance for rightmost lane)
         will_turn = 0
         if lane_number == 2:
-            will_turn = 1 if random.randint(0, 4) <= 2 else 0
+            will_turn = 1 if spawner.next_int(5) <= 2 else 0
         
-        Vehicle(lane_number, VEHICLE_TYPES[vehicle_type], direction_number, 
-               DIRECTIONS[direction_number], will_turn)
+        spawn_queue.append((lane_number, VEHICLE_TYPES[vehicle_type], direction_number,
+                            DIRECTIONS[direction_number], will_turn))
         
-        time.sleep(0.85)
+        yield 0.85
 
 
 def output_simulation_metrics():
     """Output simulation performance metrics."""
-    total_vehicles = 0
-    lane_counts = {}
-    
-    for i in range(NO_OF_SIGNALS):
-        lane_counts[f'Lane_{i + 1}'] = vehicles[DIRECTIONS[i]]['crossed']
-        total_vehicles += vehicles[DIRECTIONS[i]]['crossed']
+    lane_counts = {f'Lane_{i + 1}': int(crossed_counts[i]) for i in range(NO_OF_SIGNALS)}
+    total_vehicles = int(crossed_counts.sum())
     
     metrics = {
         'lane_counts': lane_counts,
@@ -749,9 +893,10 @@ def output_simulation_metrics():
         'vehicles_per_unit_time': float(total_vehicles) / float(time_elapsed) if time_elapsed else 0,
     }
     
-    if waiting_times:
-        avg_wait = sum(waiting_times) / len(waiting_times)
-        max_wait = max(waiting_times)
+    recorded = waiting_times[:waiting_time_count]
+    if waiting_time_count:
+        avg_wait = float(recorded.mean())
+        max_wait = float(recorded.max())
         metrics['average_waiting_time'] = avg_wait
         metrics['max_waiting_time'] = max_wait
     else:
@@ -765,39 +910,63 @@ def output_simulation_metrics():
     # Print summary
     print('Lane-wise Vehicle Counts')
     for i in range(NO_OF_SIGNALS):
-        print(f'Lane {i + 1}: {vehicles[DIRECTIONS[i]]["crossed"]}')
+        print(f'Lane {i + 1}: {crossed_counts[i]}')
     
     print(f'Total vehicles passed: {total_vehicles}')
     print(f'Total time passed: {time_elapsed}')
     print(f'Vehicles per unit time: {float(total_vehicles) / float(time_elapsed):.2f}')
     
-    if waiting_times:
-        avg_wait = sum(waiting_times) / len(waiting_times)
-        max_wait = max(waiting_times)
+    if waiting_time_count:
         print(f'Average waiting time: {avg_wait:.2f} s')
         print(f'Max waiting time: {max_wait:.2f} s')
     else:
         print('No vehicles crossed, so no waiting time data.')
 
 
+def configure_logging():
+    """Send log records to stdout from a background listener thread.
+
+    The signal loop only enqueues records, so console I/O never blocks it.
+    """
+    log_queue = queue.SimpleQueue()
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, console)
+    listener.start()
+    
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.DEBUG if VERBOSE else logging.INFO)
+    logger.propagate = False
+    return listener
+
+
 def simulation_timer():
-    """Timer to track simulation duration and output results."""
+    """Scheduler task tracking simulation duration and outputting results."""
     global time_elapsed
     
     while True:
         time_elapsed += 1
-        time.sleep(1)
-        if time_elapsed == SIM_TIME:
+        yield 1
+        # Bench runs end after their frame count and never write results
+        if time_elapsed == SIM_TIME and not BENCH_MODE:
             output_simulation_metrics()
-            os._exit(1)
+            # Everything runs on the main thread, so a normal exit unwinds
+            # through callers' finally blocks and atexit handlers
+            sys.exit(1)
+
+
+# Stand-in for Main._timed while the timing overlay is off
+NO_TIMING = nullcontext()
 
 
 class Main:
     """Main simulation class handling the Pygame display and game loop."""
     
     def __init__(self):
-        # Start background threads
-        self._start_threads()
+        self.log_listener = configure_logging()
+        
+        # Pay the JIT compilation cost before any timers start
+        warm_up_kernel()
         
         # Initialize display
         self.screen_width = 1400
@@ -808,68 +977,103 @@ class Main:
         self.black = (0, 0, 0)
         self.white = (255, 255, 255)
         
-        # Load images
-        self.background = pygame.image.load('images/mod_int.png')
-        self.red_signal = pygame.image.load('images/signals/red.png')
-        self.yellow_signal = pygame.image.load('images/signals/yellow.png')
-        self.green_signal = pygame.image.load('images/signals/green.png')
+        # Setup display; benchmarks draw into a hidden window so images can
+        # still be converted to its pixel format
+        if BENCH_MODE:
+            self.screen = pygame.display.set_mode(self.screen_size, pygame.HIDDEN)
+        else:
+            # A plain window surface, so display.update(rects) only copies the
+            # dirty rects; SCALED would present every frame whole
+            self.screen = pygame.display.set_mode(self.screen_size)
+        pygame.display.set_caption("AI Traffic Light System Simulation")
+        
+        # Load images in the display's pixel format
+        self.background = load_image('images/mod_int.png', alpha=False)
+        self.red_signal = load_image('images/signals/red.png')
+        self.yellow_signal = load_image('images/signals/yellow.png')
+        self.green_signal = load_image('images/signals/green.png')
+        
+        # Background with every signal drawn red; only the green or yellow
+        # signal is drawn over it each frame
+        self.all_red_background = self.background.copy()
+        for coords in SIGNAL_COORDS:
+            self.all_red_background.blit(self.red_signal, coords)
         self.font = pygame.font.Font(None, 30)
+        self._text_cache = OrderedDict()
         
-        # Setup display
-        self.screen = pygame.display.set_mode(self.screen_size)
-        pygame.display.set_caption("AI Traffic Light System Simulation")
+        # Recent duration of each frame phase, in seconds, for the overlay
+        self._timings = defaultdict(lambda: deque(maxlen=TIMING_WINDOW))
+        self._timing_lines = []
+        self._frame = 0
+        load_vehicle_images()
+        self.clock = pygame.time.Clock()
         
-        # Start vehicle generation
-        self._start_vehicle_generation()
+        # What was drawn last frame, for dirty-rect updates
+        self.full_redraw = True
+        self.hud_rects = {}
+        self.vehicle_rects = []
         
-        # Run main loop
-        self._run_main_loop()
-
-    def _start_threads(self):
-        """Start background threads."""
-        # Simulation timer thread
-        timer_thread = threading.Thread(name="simulationTimer", target=simulation_timer, args=())
-        timer_thread.daemon = True
-        timer_thread.start()
+        # Cleared while the window is minimized or hidden
+        self.visible = True
         
-        # Signal initialization thread
-        init_thread = threading.Thread(name="initialization", target=initialize_signals, args=())
-        init_thread.daemon = True
-        init_thread.start()
+        # Schedule the simulation tasks, driven from the main loop.
+        # Benchmarks advance a virtual clock by one frame per iteration.
+        self.bench_time = 0.0
+        if BENCH_MODE:
+            self.sim_clock = lambda: self.bench_time
+        else:
+            self.sim_clock = time.monotonic
+        self.scheduler = Scheduler(self.sim_clock)
+        self._start_tasks()
+        
+        # Run main loop. Every way out (closing the window, the end of
+        # SIM_TIME, the end of a bench run or an error) is a SystemExit, so
+        # the listener flushes the queued log records on all of them.
+        try:
+            if BENCH_MODE:
+                self._run_bench_loop(BENCH_MODE)
+            else:
+                self._run_main_loop()
+        finally:
+            self.log_listener.stop()
 
-    def _start_vehicle_generation(self):
-        """Start vehicle generation thread."""
-        vehicle_thread = threading.Thread(name="generateVehicles", target=generate_vehicles, args=())
-        vehicle_thread.daemon = True
-        vehicle_thread.start()
+    def _start_tasks(self):
+        """Schedule the timer, signal, update and vehicle generation tasks."""
+        self.scheduler.spawn(simulation_timer())
+        self.scheduler.spawn(initialize_signals())
+        self.scheduler.spawn(run_updates(self.sim_clock))
+        self.scheduler.spawn(generate_vehicles())
 
     def _run_main_loop(self):
         """Main game loop."""
         try:
             while True:
-                for event in pygame.event.get():
+                for event in self._poll_events():
                     if event.type == pygame.QUIT:
                         sys.exit()
+                    elif event.type in HIDE_EVENTS:
+                        self.visible = False
+                    elif event.type in SHOW_EVENTS:
+                        self.visible = True
+                        self.full_redraw = True
+                    elif event.type in COALESCED_EVENTS:
+                        # The window contents may have been lost
+                        self.full_redraw = True
                 
-                # Draw background
-                self.screen.blit(self.background, (0, 0))
-                
-                # Draw signals
-                self._draw_signals()
+                # Run the timer, signal, update and generator tasks that are due
+                with self._timed("tasks"):
+                    self.scheduler.run_pending()
                 
-                # Draw timers and counts
-                self._draw_timers_and_counts()
-                
-                # Draw time elapsed
-                time_text = self.font.render(f"Time Elapsed: {time_elapsed}", True, self.black, self.white)
-                self.screen.blit(time_text, (1100, 50))
-                
-                # Draw and move vehicles
-                for vehicle in simulation:
-                    self.screen.blit(vehicle.current_image, [vehicle.x, vehicle.y])
-                    vehicle.move()
-                
-                pygame.display.update()
+                # Draw the frame and push only what changed to the display;
+                # the simulation keeps running while nobody can see it
+                if self.visible:
+                    dirty = self._draw_frame()
+                    with self._timed("display"):
+                        if dirty is None:
+                            pygame.display.update()
+                        else:
+                            pygame.display.update(dirty)
+                self.clock.tick(FPS_CAP)
                 
         except Exception as e:
             print("\n\n--- EXCEPTION OCCURRED ---")
@@ -878,41 +1082,209 @@ class Main:
             pygame.quit()
             sys.exit(1)
 
-    def _draw_signals(self):
-        """Draw traffic signals on screen."""
-        for i in range(NO_OF_SIGNALS):
-            if i == current_green:
-                if current_yellow == 1:
-                    if signals[i].yellow == 0:
-                        signals[i].signal_text = "STOP"
+    def _run_bench_loop(self, frames):
+        """Render frames as fast as possible, then report the frame rate.
+
+        Input polling, the frame cap and display updates are skipped; the
+        simulation clock advances by one ``FPS_CAP`` frame per iteration.
+        """
+        start = time.perf_counter()
+        for _ in range(frames):
+            self.scheduler.run_pending()
+            self._draw_frame()
+            self.bench_time += 1.0 / FPS_CAP
+        elapsed = time.perf_counter() - start
+        print(f"Bench: {frames} frames in {elapsed:.3f} s ({frames / elapsed:.1f} FPS), "
+              f"{len(simulation)} vehicles")
+        pygame.quit()
+        sys.exit(0)
+
+    def _poll_events(self):
+        """Return this frame's handled events with repeated window events collapsed.
+
+        Mouse motion and other unhandled events are cleared inside pygame
+        without ever becoming Python Event objects.
+        """
+        events = []
+        latest_by_type = {}
+        polled = pygame.event.get(eventtype=HANDLED_EVENTS)
+        # Polling above already pumped; pumping again could drop a new QUIT unread
+        pygame.event.clear(pump=False)
+        for event in polled:
+            if event.type in COALESCED_EVENTS:
+                latest_by_type[event.type] = event
+            else:
+                events.append(event)
+        events.extend(latest_by_type.values())
+        return events
+
+    def _timed(self, phase):
+        """Return a context recording how long the enclosed block takes.
+
+        With the overlay off this is a shared no-op context, so untimed
+        frames do not pay for a generator-based context manager.
+        """
+        if not SHOW_TIMINGS:
+            return NO_TIMING
+        return self._timing(phase)
+
+    @contextmanager
+    def _timing(self, phase):
+        start = time.perf_counter()
+        yield
+        self._timings[phase].append(time.perf_counter() - start)
+
+    def _add_timings(self, items):
+        """Add the FPS and per-phase timing overlay to this frame's items."""
+        self._frame += 1
+        if self._frame % TIMING_REFRESH == 1:
+            self._timing_lines = [f"FPS: {self.clock.get_fps():.1f}"] + [
+                f"{phase}: {sum(durations) / len(durations) * 1000:.2f} ms"
+                for phase, durations in self._timings.items()
+            ]
+        for row, line in enumerate(self._timing_lines):
+            items[('timing', row)] = (self._text(line, self.white, self.black), (10, 10 + 22 * row))
+
+    def _text(self, text, fg, bg):
+        """Return the rendered surface for text, re-rendering only on a cache miss."""
+        key = (text, fg, bg)
+        cache = self._text_cache
+        surface = cache.get(key)
+        if surface is None:
+            surface = self.font.render(text, True, fg, bg)
+            cache[key] = surface
+            if len(cache) > TEXT_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return surface
+
+    def _draw_frame(self):
+        """Redraw what changed since the last frame and return the dirty rects.
+
+        Signals and text are only repainted when their surface or position
+        changed, or when something repainted this frame overlaps them. Every
+        vehicle is erased and redrawn. Returns None after a full redraw, when
+        the whole display has to be updated.
+        """
+        screen = self.screen
+        background = self.all_red_background
+        items = {}
+        with self._timed("hud"):
+            self._add_signals(items)
+            self._add_timers_and_counts(items)
+            items['time'] = (
+                self._text(f"Time Elapsed: {time_elapsed}", self.black, self.white),
+                (1100, 50)
+            )
+            if SHOW_TIMINGS:
+                self._add_timings(items)
+            hud = {key: (surface, surface.get_rect(topleft=pos)) for key, (surface, pos) in items.items()}
+        with self._timed("vehicles"):
+            batch = self._vehicle_batch()
+            vehicle_rects = [image.get_rect(topleft=pos).inflate(2, 2) for image, pos in batch]
+        
+        with self._timed("blit"):
+            if self.full_redraw:
+                self.full_redraw = False
+                screen.blit(background, (0, 0))
+                screen.blits([(surface, rect) for surface, rect in hud.values()], doreturn=False)
+                screen.blits(batch, doreturn=False)
+                self.hud_rects = hud
+                self.vehicle_rects = vehicle_rects
+                return None
+            
+            # Areas to restore from the background: last frame's vehicles, plus
+            # any text or signal that changed, appeared or disappeared
+            areas = list(self.vehicle_rects)
+            repaint = set()
+            for key, (surface, rect) in hud.items():
+                previous = self.hud_rects.get(key)
+                if previous is None:
+                    areas.append(rect)
+                    repaint.add(key)
+                elif previous[0] is not surface or previous[1] != rect:
+                    areas.append(rect.union(previous[1]))
+                    repaint.add(key)
+            for key, (surface, rect) in self.hud_rects.items():
+                if key not in hud:
+                    areas.append(rect)
+            
+            # Anything under a restored area has to be drawn again
+            grown = True
+            while grown:
+                grown = False
+                for key, (surface, rect) in hud.items():
+                    if key not in repaint and rect.collidelist(areas) != -1:
+                        areas.append(rect)
+                        repaint.add(key)
+                        grown = True
+            
+            for area in areas:
+                screen.blit(background, area, area)
+            screen.blits([hud[key] for key in hud if key in repaint], doreturn=False)
+            screen.blits(batch, doreturn=False)
+            self.hud_rects = hud
+            self.vehicle_rects = vehicle_rects
+            return areas + vehicle_rects
+
+    def _vehicle_batch(self):
+        """Return the (image, position) blit sequence for every vehicle."""
+        drawn = list(simulation.values())
+        count = store.count
+        xs = store.pos_x[:count].tolist()
+        ys = store.pos_y[:count].tolist()
+        angles = store.rotate_angle[:count].tolist()
+        rotated = ROTATED_IMAGES
+        batch = []
+        for vehicle in drawn:
+            idx = vehicle.idx
+            angle = angles[idx]
+            if angle:
+                image = rotated[(vehicle.vehicle_class, vehicle.direction_number, int(angle))]
+            else:
+                image = vehicle.original_image
+            batch.append((image, (xs[idx], ys[idx])))
+        return batch
+
+    def _add_signals(self, items):
+        """Add the green or yellow signal to this frame's items and set every signal's text.
+
+        Red signals are already part of ``all_red_background``.
+        """
+        green = current_green
+        yellow = current_yellow
+        for i, signal in enumerate(signals):
+            if i == green:
+                if yellow == 1:
+                    if signal.yellow == 0:
+                        signal.signal_text = "STOP"
                     else:
-                        signals[i].signal_text = str(signals[i].yellow)
-                    self.screen.blit(self.yellow_signal, SIGNAL_COORDS[i])
+                        signal.signal_text = str(signal.yellow)
+                    items[('signal', i)] = (self.yellow_signal, SIGNAL_COORDS[i])
                 else:
-                    if signals[i].green == 0:
-                        signals[i].signal_text = "SLOW"
+                    if signal.green == 0:
+                        signal.signal_text = "SLOW"
                     else:
-                        signals[i].signal_text = str(signals[i].green)
-                    self.screen.blit(self.green_signal, SIGNAL_COORDS[i])
+                        signal.signal_text = str(signal.green)
+                    items[('signal', i)] = (self.green_signal, SIGNAL_COORDS[i])
             else:
-                if signals[i].red <= 10 and signals[i].red > 0:
-                    signals[i].signal_text = str(signals[i].red)
+                if signal.red <= 10 and signal.red > 0:
+                    signal.signal_text = str(signal.red)
                 else:
-                    signals[i].signal_text = "---"
-                self.screen.blit(self.red_signal, SIGNAL_COORDS[i])
-
-    def _draw_timers_and_counts(self):
-        """Draw signal timers and vehicle counts."""
-        for i in range(NO_OF_SIGNALS):
-            # Draw timer
-            timer_text = self.font.render(str(signals[i].signal_text), True, self.white, self.black)
-            self.screen.blit(timer_text, TIMER_COORDS[i])
-            
-            # Draw vehicle count
-            waiting_count = sum(1 for lane in range(3) 
-                              for v in vehicles[DIRECTIONS[i]][lane] if v.crossed == 0)
-            count_text = self.font.render(str(waiting_count), True, self.black, self.white)
-            self.screen.blit(count_text, COUNT_COORDS[i])
+                    signal.signal_text = "---"
+
+    def _add_timers_and_counts(self, items):
+        """Add the signal timers and vehicle counts to this frame's items."""
+        text = self._text
+        white = self.white
+        black = self.black
+        # Uncrossed vehicles per direction, kept current by spawning and _mark_crossed
+        waiting_counts = waiting_summary.sum(axis=1).tolist()
+        for i, (signal, timer_coords, count_coords, waiting_count) in enumerate(
+                zip(signals, TIMER_COORDS, COUNT_COORDS, waiting_counts)):
+            items[('timer', i)] = (text(str(signal.signal_text), white, black), timer_coords)
+            items[('count', i)] = (text(str(waiting_count), black, white), count_coords)
 
 
 if __name__ == "__main__":
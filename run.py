@@ -4,23 +4,45 @@ Run script for AI Traffic Light System
 """
 
 import os
-import sys
-import subprocess
+import argparse
+import cProfile
+import pstats
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the AI Traffic Light System simulation")
+    parser.add_argument("--bench", type=int, metavar="N", default=0,
+                        help="render N frames in a hidden window as fast as possible, then print the frame rate")
+    parser.add_argument("--profile", action="store_true",
+                        help="run under cProfile and print the stats sorted by own time")
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
     print("🚦 Starting AI Traffic Light System...")
     print("Press Ctrl+C to exit")
     print("-" * 40)
     
+    # The simulation reads bench mode from the environment when imported
+    if args.bench:
+        os.environ["BENCH_MODE"] = str(args.bench)
+    
     try:
-        # Run the main simulation
-        subprocess.run([sys.executable, "ai_traffic_simulation.py"])
+        # Run the main simulation in this process
+        from ai_traffic_simulation import Main
+        if args.profile:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                Main()
+            finally:
+                profiler.disable()
+                pstats.Stats(profiler).sort_stats("tottime").print_stats(30)
+        else:
+            Main()
     except KeyboardInterrupt:
         print("\n👋 Simulation stopped by user")
-    except FileNotFoundError:
-        print("❌ Error: ai_traffic_simulation.py not found!")
-        print("Make sure you're in the correct directory")
     except Exception as e:
         print(f"❌ Error running simulation: {e}")
 